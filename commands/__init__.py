@@ -1,8 +1,28 @@
+import importlib
+
 from commands.base_command import BaseCommand
-from .scan_command import ScanCommand
-from .interface_monitor import MonitorCommand
-from .interface_managed import ManagedCommand
-COMMAND_REGISTRY = {
-    cls.NAME: cls
-    for cls in BaseCommand.__subclasses__()
+
+# Command name -> (module path, class name). Command modules are only
+# imported once the command is actually requested.
+COMMAND_REGISTRY: dict[str, tuple[str, str]] = {
+    "scan": ("commands.scan_command", "ScanCommand"),
+    "monitor": ("commands.interface_monitor", "MonitorCommand"),
+    "managed": ("commands.interface_managed", "ManagedCommand"),
 }
+
+_COMMAND_CLASSES = {class_name: module_path for module_path, class_name in COMMAND_REGISTRY.values()}
+
+
+def load_command(name: str):
+    """
+    Imports and returns the command class registered under `name`.
+    """
+    module_path, class_name = COMMAND_REGISTRY[name]
+    module = importlib.import_module(module_path)
+    return getattr(module, class_name)
+
+
+def __getattr__(name: str):
+    if name in _COMMAND_CLASSES:
+        return getattr(importlib.import_module(_COMMAND_CLASSES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
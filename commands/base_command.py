@@ -1,5 +1,6 @@
+from __future__ import annotations
+
 import abc
-import argparse
 
 
 class BaseCommand(abc.ABC):
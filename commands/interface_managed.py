@@ -1,10 +1,8 @@
-import argparse
+from __future__ import annotations
+
 import sys
 
 from commands import BaseCommand
-from core.interface_management import InterfaceManagement
-from core.conflict_resolver import ConflictResolver
-
 from utils import check_interface_exists
 
 
@@ -26,11 +24,15 @@ class ManagedCommand(BaseCommand):
 
         print(f"[*] Switching {interface} to MANAGED mode...")
 
+        from core.interface_management import InterfaceManagement
+
         im = InterfaceManagement(interface)
         try:
             im.managed()
             msg = f"[SUCCESS] {interface} is now in MANAGED mode."
             if restart:
+                from core.conflict_resolver import ConflictResolver
+
                 resolver = ConflictResolver()
                 restored = resolver.restore()
                 if restored:
@@ -44,3 +46,5 @@ class ManagedCommand(BaseCommand):
         except Exception as e:
             print(f"[ERROR] Unexpected failure: {e}")
             sys.exit(1)
+
+        return msg
@@ -1,9 +1,8 @@
-import argparse
+from __future__ import annotations
+
 import sys
 
 from commands import BaseCommand
-from core.interface_management import InterfaceManagement
-from core.conflict_resolver import ConflictResolver
 from utils import check_interface_exists
 
 
@@ -28,13 +27,17 @@ class MonitorCommand(BaseCommand):
 
         if kill:
             print("[*] Killing conflicting processes...")
+            from core.conflict_resolver import ConflictResolver
+
             resolver = ConflictResolver()
             resolver.check_and_kill()
 
+        from core.interface_management import InterfaceManagement
+
         im = InterfaceManagement(interface)
         try:
             im.monitor()
-            print(f"[SUCCESS] {interface} is now in MONITOR mode.")
+            msg = f"[SUCCESS] {interface} is now in MONITOR mode."
 
         except RuntimeError as e:
             print(f"[ERROR] {e}")
@@ -42,3 +45,5 @@ class MonitorCommand(BaseCommand):
         except Exception as e:
             print(f"[ERROR] Unexpected failure: {e}")
             sys.exit(1)
+
+        return msg
@@ -1,8 +1,6 @@
-import argparse
+from __future__ import annotations
 
 from commands import BaseCommand
-from core.scan import perform_scan
-from utils.interface_checker import list_interfaces
 
 
 class ScanCommand(BaseCommand):
@@ -32,6 +30,8 @@ class ScanCommand(BaseCommand):
     def execute(self, **kwargs):
         interface = kwargs.get('interface')
         if not interface:
+            from utils.interface_checker import list_interfaces
+
             print(f"[ERROR] Interface required. Available: {', '.join(list_interfaces())}")
             raise SystemExit(1)
 
@@ -41,6 +41,8 @@ class ScanCommand(BaseCommand):
         no_stop = kwargs.get('no_stop', False)
         output = kwargs.get('out')
 
+        from core.scan import perform_scan
+
         results = perform_scan(
             interface=interface,
             bssid=bssid,
@@ -1,9 +1,11 @@
+import os
 import signal
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from typing import ClassVar, FrozenSet, List
 
-import psutil
+from utils import run_tool
 
 
 @dataclass
@@ -26,42 +28,51 @@ class ConflictResolver:
     system services and processes that may interfere with low-level
     network operations.
     """
-    PROCESSES = {'wpa_action', 'wpa_supplicant', 'wpa_cli', 'dhclient', 'ifplugd', 'dhcdbd', 'dhcpcd', 'udhcpc',
-                 'NetworkManager', 'knetworkmanager', 'avahi-autoipd', 'avahi-daemon', 'wlassistant', 'wifibox',
-                 'net_applet', 'wicd-daemon', 'wicd-client', 'iwd', 'hostapd'
-                 }
-    SERVICES = {'wicd', 'network-manager', 'avahi-daemon', 'NetworkManager', 'wpa_supplicant'}
+    PROCESSES: ClassVar[FrozenSet[str]] = frozenset({
+        'wpa_action', 'wpa_supplicant', 'wpa_cli', 'dhclient', 'ifplugd', 'dhcdbd', 'dhcpcd', 'udhcpc',
+        'NetworkManager', 'knetworkmanager', 'avahi-autoipd', 'avahi-daemon', 'wlassistant', 'wifibox',
+        'net_applet', 'wicd-daemon', 'wicd-client', 'iwd', 'hostapd'
+    })
+    # Raw /proc/<pid>/comm contents are compared without decoding them first.
+    PROCESSES_BYTES: ClassVar[FrozenSet[bytes]] = frozenset(name.encode() for name in PROCESSES)
+    SERVICES: ClassVar[FrozenSet[str]] = frozenset({'wicd', 'network-manager', 'avahi-daemon', 'NetworkManager',
+                                                    'wpa_supplicant'})
+    # Unit file states for which `systemctl is-enabled` reports success.
+    ENABLED_STATES: ClassVar[FrozenSet[str]] = frozenset({'enabled', 'enabled-runtime', 'static', 'alias',
+                                                          'indirect', 'generated', 'transient'})
 
     def _check_services(self, kill: bool = False):
         """
-        Iterates over the predefined list of services and checks their
-        status using systemctl. Optionally stops the services if requested.
+        Checks the status of the predefined list of services with a single
+        `systemctl is-active` call. Optionally stops the services if requested.
 
         :param kill: If True, stop all detected running services.
         :return: A list of service names that were found running.
         """
-        found_services = list()
-        for service in self.SERVICES:
-            result = subprocess.run(['systemctl', 'status', service], capture_output=True, text=True)
-            if result.returncode == 0:
-                found_services.append(service)
-                if kill:
-                    self._stop_service(service)
+        services = tuple(self.SERVICES)
+        result = run_tool('systemctl', 'is-active', *services, stdout=subprocess.PIPE)
+
+        # is-active prints one state per unit, in the order they were given.
+        found_services = [service for service, state in zip(services, result.stdout.splitlines())
+                          if state == b'active']
+        if kill and found_services:
+            self._stop_services(found_services)
         return found_services
 
     @staticmethod
-    def _stop_service(service):
+    def _stop_services(services: List[str]):
         """
-        Attempts to stop the specified service using systemctl and prints
-        the result of the operation.
+        Attempts to stop the specified services with a single systemctl call
+        and prints the result of the operation.
 
-        :param service: Name of the systemd service to stop.
+        :param services: Names of the systemd services to stop.
         """
-        result = subprocess.run(['systemctl', 'stop', service], capture_output=True, text=True)
+        result = run_tool('systemctl', 'stop', *services)
+        names = ', '.join(services)
         if result.returncode == 0:
-            print(f"Service {service} stopped successfully.")
+            print(f"Services {names} stopped successfully.")
         else:
-            print(f"Service {service} stopped unsuccessfully. Status: {result.returncode}")
+            print(f"Services {names} stopped unsuccessfully. Status: {result.returncode}")
 
     def _check_processes(self, kill: bool = False):
         """
@@ -69,71 +80,122 @@ class ConflictResolver:
         a predefined list of known conflicting processes. Optionally sends
         a termination signal to the detected processes.
 
+        Names are read straight from /proc/<pid>/comm and matches are
+        signalled directly with os.kill.
+
         :param kill: If True, send a termination signal to found processes.
         :return: A list of process names that were found running.
         """
         found_processes = list()
-        for process in psutil.process_iter():
-            if process.name() in self.PROCESSES:
-                found_processes.append(process.name())
+        targets = self.PROCESSES_BYTES
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                # comm is at most 16 bytes (15 chars + newline): one unbuffered read.
+                with open(f'/proc/{pid}/comm', 'rb', buffering=0) as f:
+                    name = f.read(16).rstrip(b'\n')
+            except OSError:
+                # Process exited between listdir() and open()
+                continue
+            if name in targets:
+                found_processes.append(name.decode())
                 if kill:
-                    self._kill_processes(process)
+                    self._kill_processes(int(pid))
         return found_processes
 
     @staticmethod
-    def _kill_processes(process: psutil.Process, sig=signal.SIGTERM):
+    def _kill_processes(pid: int, sig=signal.SIGTERM):
         """
         Handles common exceptions such as the process already terminating
         or insufficient permissions.
 
-        :param process: psutil.Process instance to signal.
+        :param pid: PID of the process to signal.
         :param sig: Signal to send (default: SIGTERM).
         """
         try:
-            process.send_signal(sig)
-        except psutil.NoSuchProcess:
+            os.kill(pid, sig)
+        except ProcessLookupError:
             pass
-        except psutil.AccessDenied:
+        except PermissionError:
             print("Unable to kill process, are you root?")
 
     def check(self) -> CheckResult:
         """
+        Runs the service and process checks concurrently. Both only read
+        state: the first waits on systemctl, the second reads /proc.
+
         :return: CheckResult containing lists of running services and processes.
         """
-        services = self._check_services()
-        process = self._check_processes()
-        return CheckResult(services=services, processes=process)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            services = executor.submit(self._check_services)
+            process = executor.submit(self._check_processes)
+            return CheckResult(services=services.result(), processes=process.result())
 
     def check_and_kill(self) -> CheckResult:
         """
         Check for conflicting services and processes and terminate them.
 
         Stops detected systemd services and sends termination signals
-        to detected processes.
+        to detected processes. Services are stopped first, so their daemons
+        are not signalled out from under systemd (and restarted by it); only
+        what is left afterwards is killed.
 
         :return: CheckResult containing lists of affected services and processes.
         """
         services = self._check_services(kill=True)
-        process = self._check_processes(kill=True)
-        return CheckResult(services=services, processes=process)
+        processes = self._check_processes(kill=True)
+        return CheckResult(services=services, processes=processes)
+
+    @staticmethod
+    def _enabled_services(services: List[str]) -> List[str]:
+        """
+        Queries the unit file state of all given services with a single
+        `systemctl show` call.
+
+        :param services: Names of the systemd services to query.
+        :return: The subset of services that are enabled.
+        """
+        result = run_tool('systemctl', 'show', '--property=UnitFileState', *services,
+                          stdout=subprocess.PIPE, text=True)
+
+        # One "UnitFileState=..." block per unit, in order, separated by blank lines.
+        blocks = result.stdout.strip('\n').split('\n\n')
+        enabled = []
+        for service, block in zip(services, blocks):
+            state = block.partition('=')[2].strip()
+            if state in ConflictResolver.ENABLED_STATES:
+                enabled.append(service)
+        return enabled
+
+    @staticmethod
+    def _restart_service(service: str) -> bool:
+        """
+        Restarts the specified service using systemctl.
+
+        :param service: Name of the systemd service to restart.
+        :return: True if the restart succeeded.
+        """
+        return run_tool('systemctl', 'restart', service).returncode == 0
 
     @staticmethod
     def restore() -> List[str]:
         """
         Restores critical networking services that may have been killed.
+
+        Restarts are independent and mostly spent waiting on systemd,
+        so they are issued concurrently.
         """
         targets = ['NetworkManager', 'avahi-daemon', 'wicd', 'wpa_supplicant']
+        enabled = ConflictResolver._enabled_services(targets)
+        if not enabled:
+            return []
 
         results = []
-        for service in targets:
-            check = subprocess.run(['systemctl', 'is-enabled', service],
-                                   capture_output=True, text=True)
-            if check.returncode == 0:
-                print(f"[*] Restoring service: {service}...", end=' ', flush=True)
-                try:
-                    subprocess.run(['systemctl', 'restart', service], check=True, capture_output=True)
-                    print("OK")
+        with ThreadPoolExecutor(max_workers=len(enabled)) as executor:
+            outcomes = executor.map(ConflictResolver._restart_service, enabled)
+            for service, ok in zip(enabled, outcomes):
+                print(f"[*] Restoring service: {service}... {'OK' if ok else 'FAILED'}")
+                if ok:
                     results.append(service)
-                except subprocess.CalledProcessError:
-                    print("FAILED")
         return results
@@ -1,15 +1,14 @@
 import subprocess
-from enum import Enum
 
+from utils import run_tool
 
-class InterfaceMode(str, Enum):
-    MONITOR = "monitor"
-    MANAGED = "managed"
+# Interface modes understood by `iw ... type <mode>`
+MONITOR = "monitor"
+MANAGED = "managed"
 
-
-class InterfaceAction(str, Enum):
-    UP = "up"
-    DOWN = "down"
+# Link states understood by `ip link set <iface> <state>`
+UP = "up"
+DOWN = "down"
 
 
 class InterfaceManagement:
@@ -27,25 +26,39 @@ class InterfaceManagement:
 
     def __init__(self, interface: str):
         self._interface = interface
+        # The wiphy index of a netdev is stable, so it is looked up once and
+        # reused for every mode switch until refresh_phy() is called.
+        self.phy = self._get_phy()
+
+    def refresh_phy(self) -> str:
+        """
+        Re-reads the physical device name, e.g. after the adapter was re-plugged.
+        """
         self.phy = self._get_phy()
+        return self.phy
 
     def _delete_interface(self) -> None:
-        subprocess.run(['iw', 'dev', self._interface, 'del'],
-                       check=True, capture_output=True)
+        run_tool('iw', 'dev', self._interface, 'del', check=True, stderr=subprocess.PIPE)
 
     def _create_interface(self, mode_str) -> None:
-        subprocess.run(
-            ['iw', 'phy', self.phy, 'interface', 'add', self._interface, 'type', mode_str],
-            check=True, capture_output=True
-        )
+        run_tool('iw', 'phy', self.phy, 'interface', 'add', self._interface, 'type', mode_str,
+                 check=True, stderr=subprocess.PIPE)
 
     def _get_phy(self) -> str:
         """
         Gets the physical device name (phy0, phy1) needed to re-create the interface.
+
+        Read from sysfs when the wireless driver exposes it, otherwise parsed
+        from `iw <iface> info`.
         """
         try:
-            cmd = ['iw', self._interface, 'info']
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            with open(f"/sys/class/net/{self._interface}/phy80211/name") as f:
+                return f.read().strip()
+        except OSError:
+            pass
+
+        try:
+            result = run_tool('iw', self._interface, 'info', stdout=subprocess.PIPE, text=True, check=True)
 
             for line in result.stdout.splitlines():
                 if 'wiphy' in line:
@@ -56,13 +69,14 @@ class InterfaceManagement:
         except subprocess.CalledProcessError:
             raise ValueError(f"Interface {self._interface} not found or 'iw' command failed.")
 
-    def _set_interface_mode(self, mode: InterfaceMode) -> None:
+    def _set_interface_mode(self, mode_str: str) -> None:
         """
         Reliably switches mode by deleting the interface and re-creating it.
+
+        No explicit `ip link set down` is needed first: deleting the netdev
+        closes it in the kernel.
         """
-        mode_str = mode.value
         try:
-            self.down(check=False, capture_output=True)
             self._delete_interface()
             self._create_interface(mode_str=mode_str)
             self.up()
@@ -71,30 +85,29 @@ class InterfaceManagement:
             err_msg = e.stderr.decode().strip() if e.stderr else "Unknown error"
             raise RuntimeError(f"Failed to set {mode_str} mode: {err_msg}")
 
-    def down(self, check: bool = True, capture_output: bool = False) -> None:
+    def down(self, check: bool = True) -> None:
         """
         Bring the network interface down.
         """
-        subprocess.run(['ip', 'link', 'set', self._interface, InterfaceAction.DOWN.value],
-                       check=check, capture_output=capture_output)
+        run_tool('ip', 'link', 'set', self._interface, DOWN, check=check, stdout=None, stderr=None)
 
     def up(self) -> None:
         """
         Bring the network interface up.
         """
-        subprocess.run(['ip', 'link', 'set', self._interface, InterfaceAction.UP.value], check=True)
+        run_tool('ip', 'link', 'set', self._interface, UP, check=True, stdout=None, stderr=None)
 
     def monitor(self):
         """
         Switch the interface to monitor mode using `iw`.
         """
-        return self._set_interface_mode(InterfaceMode.MONITOR)
+        return self._set_interface_mode(MONITOR)
 
     def managed(self):
         """
         Switch the interface to managed mode using `iw`.
         """
-        return self._set_interface_mode(InterfaceMode.MANAGED)
+        return self._set_interface_mode(MANAGED)
 
 
 __all__ = ["InterfaceManagement"]
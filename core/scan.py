@@ -2,25 +2,60 @@ import datetime
 import itertools
 import json
 import os
+import re
 import time
 
-from core.wireless_monitor import WirelessMonitor
+from core.wireless_monitor import IwOutput, WirelessMonitor
 
+# `iw ... scan` only returns once the kernel has announced the new scan results,
+# so loops need no fixed pacing. The driver may still refuse a scan while it is
+# busy (e.g. with another scan); only then is the next attempt delayed.
+BUSY_ERROR = "Device or resource busy"
+BUSY_RETRY_DELAY = 0.3
+BUSY_RETRIES = 10
 
-def get_unique_filename(base_path: str) -> str:
+
+def _next_filename(base_path: str) -> str:
     """
-    If base_path exists, append _1, _2, etc. until a free filename is found.
+    Returns base_path with the next counter (_1, _2, etc.) after the highest one
+    already present next to it, found with a single directory listing.
     """
-    if not os.path.exists(base_path):
-        return base_path
-
     name, ext = os.path.splitext(base_path)
-    counter = 1
+    directory, prefix = os.path.split(name)
+    pattern = re.compile(rf"{re.escape(prefix)}_(\d+){re.escape(ext)}")
+
+    counters = [int(m.group(1)) for m in map(pattern.fullmatch, os.listdir(directory or '.')) if m]
+    return f"{name}_{max(counters, default=0) + 1}{ext}"
+
+
+def open_unique_file(base_path: str, buffering: int = -1):
+    """
+    Creates and opens base_path for writing. If it already exists, the next free
+    name_N variant is used instead. O_EXCL folds the existence check into the
+    open itself, so a file is never shared with a concurrent run.
+    """
+    path = base_path
     while True:
-        new_path = f"{name}_{counter}{ext}"
-        if not os.path.exists(new_path):
-            return new_path
-        counter += 1
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            path = _next_filename(base_path)
+            continue
+        return os.fdopen(fd, 'w', buffering=buffering, encoding='utf-8')
+
+
+def _json_default(obj):
+    """
+    Serializes scan entries (IwOutput dataclasses) for json.dumps. Records hold
+    the parsed fields only, not the derived Enc/Cipher display labels.
+    """
+    if isinstance(obj, IwOutput):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Built once: json.dumps with custom options constructs a new encoder per call.
+_RECORD_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_json_default)
 
 
 def perform_scan(interface: str, bssid: str = 'None', loops: int = 1, no_stop: bool = False,
@@ -28,28 +63,45 @@ def perform_scan(interface: str, bssid: str = 'None', loops: int = 1, no_stop: b
     monitor = WirelessMonitor(interface=interface)
     results = dict()
 
+    # One output file per run, kept open and line-buffered so every record
+    # reaches the file as soon as it is written. It is only created with the
+    # first record, so a run that fails before then leaves nothing behind.
+    out_file = None
+
     loop_iterator = itertools.count() if no_stop else range(loops)
     try:
         for i in loop_iterator:
             msg = monitor.perform_scan()
+            for _ in range(BUSY_RETRIES):
+                if BUSY_ERROR not in msg:
+                    break
+                time.sleep(BUSY_RETRY_DELAY)
+                msg = monitor.perform_scan()
             if "[FAILURE]" in msg:
                 raise RuntimeError(msg)
             current_scan_data = monitor.get_results(reverse_scan=reverse)
             results.update(current_scan_data)
 
             if output:
-                output_file = get_unique_filename(output)
-                with open(output_file, 'a') as f:
-                    t = datetime.datetime.now()
-                    record = {
-                        "timestamp": t.isoformat(),
-                        "loop": i + 1,
-                        "scan_data": {str(k): v for k, v in current_scan_data.items()}
-                    }
-                    f.write(json.dumps(record) + "\n")
-            time.sleep(0.3)
+                if out_file is None:
+                    out_file = open_unique_file(output, buffering=1)
+                t = datetime.datetime.now()
+                record = {
+                    "timestamp": t.isoformat(),
+                    "loop": i + 1,
+                    # json turns the integer index keys into strings itself
+                    "scan_data": current_scan_data
+                }
+                # Only this loop's results are encoded, never the accumulated set.
+                out_file.write(_RECORD_ENCODER.encode(record))
+                out_file.write("\n")
     except KeyboardInterrupt:
         if no_stop:
             print('\nScan interrupted.')
+    finally:
+        if out_file:
+            out_file.flush()
+            os.fsync(out_file.fileno())
+            out_file.close()
 
     return results
@@ -1,39 +1,89 @@
-from dataclasses import dataclass
-import subprocess
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
 import re
-from typing import Dict, List, Optional
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from .vulnerability_database import VulnerabilityDatabase
-from utils import check_interface_exists
+from utils import check_interface_exists, tool_path
+
+# Six hex octets separated by ':' or '-'; compiled once at import
+_is_mac = re.compile(r"(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}").fullmatch
 
+# Results table row: each column is padded and cut to its width, so over-long
+# values cannot push the following columns out of line.
+ROW_FMT = "{!s:<4.4} {!s:<18.18} {!s:<22.22} {!s:<4.4} {!s:<7.7} {!s:<6.6} {!s:<10.10} {!s:<10.10}"
 
-@dataclass
+
+@dataclass(slots=True)
 class IwOutput:
     bssid: str
     essid: str = "<Hidden>"
     freq: int = 0
     channel: int = 0
-    signal_dbm: float = -100.0
+    # Whole dBm, truncated the same way the results table shows it
+    signal_dbm: int = -100
     wpa: bool = False
     wpa2: bool = False
     tkip: bool = False
     ccmp: bool = False
     wep: bool = False
     wps: bool = False
+    # Display strings derived from the flags above by finalize(); not
+    # constructor arguments, and left out of as_dict()
+    enc_str: str = field(default="", init=False)
+    cipher_str: str = field(default="", init=False)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the parsed fields as a plain dict, e.g. for JSON output.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+    def finalize(self) -> "IwOutput":
+        """
+        Derives the encryption and cipher display strings from the parsed flags.
+        """
+        if self.wpa2:
+            self.enc_str = "WPA2"
+        elif self.wpa:
+            self.enc_str = "WPA"
+        elif self.wep:
+            self.enc_str = "WEP"
+        else:
+            self.enc_str = "Open"
+
+        if self.ccmp and self.tkip:
+            self.cipher_str = "CCMP+TKIP"
+        elif self.ccmp:
+            self.cipher_str = "CCMP"
+        elif self.tkip:
+            self.cipher_str = "TKIP"
+        return self
 
 
 class WirelessMonitor:
     """
     Discovers APs using `iw`. Parses the output.
     """
-    RE_BSS_MAC = re.compile(r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')
-    RE_DS_CHANNEL = re.compile(r'^\s*DS Parameter set: channel (\d+)')
-    RE_PRIMARY_CHANNEL = re.compile(r'^\s*\* primary channel: (\d+)')
 
     def __init__(self, interface: str, vuln_file: str = "vulnwsc.txt"):
         self.interface = interface
         self.vuln_db = VulnerabilityDatabase(vuln_file)
         self.networks: Dict[str, IwOutput] = {}
+        # First token of an 'iw scan' line -> handler for that field
+        self._field_handlers = {
+            "SSID:": self._on_ssid,
+            "DS": self._on_ds_parameter,
+            "signal:": self._on_signal,
+            "WPA:": self._on_wpa,
+            "RSN:": self._on_rsn,
+            "capability:": self._on_capability,
+            "WPS:": self._on_wps,
+            "*": self._on_sub_field,
+        }
 
     def perform_scan(self) -> str:
         """
@@ -42,18 +92,26 @@ class WirelessMonitor:
         check_interface_exists(self.interface)
 
         try:
-            cmd = ["sudo", "iw", "dev", self.interface, "scan"]
-            proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-            scanned_networks = self._parse_iw_output(proc.stdout)
+            # iw stays a bare name so sudo resolves it via its secure_path (and
+            # sudoers rules naming it match); only sudo runs with the caller's PATH.
+            cmd = [tool_path("sudo"), "iw", "dev", self.interface, "scan"]
+            # Parse while iw is still writing instead of buffering its whole output first.
+            # stderr goes to a file, as a second pipe left unread while stdout is
+            # consumed would block iw once its buffer fills.
+            with tempfile.TemporaryFile(mode="w+") as err_file:
+                with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_file, text=True) as proc:
+                    scanned_networks = list(self._iter_iw_networks(proc.stdout))
+                err_file.seek(0)
+                stderr = err_file.read()
+
+            if proc.returncode != 0:
+                return f"[FAILURE] Scan failed (Exit Code {proc.returncode}): {stderr.strip()}"
 
             for net in scanned_networks:
                 self.networks[net.bssid] = net
 
             return f"[SUCCESS] Scan Complete. Found {len(scanned_networks)} APs."
 
-        except subprocess.CalledProcessError as e:
-            return f"[FAILURE] Scan failed (Exit Code {e.returncode}): {e.stderr.strip()}"
         except Exception as e:
             return f"[FAILURE] Unexpected error: {e}"
 
@@ -61,126 +119,139 @@ class WirelessMonitor:
         """
         Parses 'iw scan' output.
         """
-        networks = []
+        return list(self._iter_iw_networks(raw_output.splitlines()))
+
+    def _iter_iw_networks(self, lines: Iterable[str]) -> Iterator[IwOutput]:
+        """
+        Parses 'iw scan' output line by line, yielding each network once its
+        block is complete.
+
+        Each line is routed on its first token to the handler for that field;
+        lines without a handler are skipped after a single dict lookup.
+        """
         current_net: Optional[IwOutput] = None
+        # Bound once; the loop body runs for every line of iw output
+        get_handler = self._field_handlers.get
+        is_mac = _is_mac
 
-        lines = raw_output.splitlines()
         for line in lines:
-            line = line.strip()
-            if not line:
+            # Only the leading token is split off; handlers parse the rest.
+            parts = line.split(None, 1)
+            if not parts:
                 continue
-
-            tokens = line.split()
-            token = tokens[0]
+            token = parts[0]
+            rest = parts[1] if len(parts) > 1 else ""
 
             if token == "BSS":
-                if current_net:
-                    networks.append(current_net)
-
-                mac_candidate = tokens[1].split('(')[0]
-
-                if self.RE_BSS_MAC.match(mac_candidate):
+                # "BSS 00:11:22:33:44:55(on wlan0) -- associated"
+                end = rest.find('(')
+                if end >= 0:
+                    mac_candidate = rest[:end]
+                else:
+                    mac_candidate = rest.split(None, 1)[0] if rest else ""
+
+                # Also reached by the "BSS Load:" element inside a block
+                if is_mac(mac_candidate):
+                    if current_net:
+                        yield current_net.finalize()
                     current_net = IwOutput(bssid=mac_candidate.upper())
                 continue
 
             if current_net is None:
                 continue
 
-            if token == "SSID:":
-                ssid_val = line[5:].strip()
-                if ssid_val:
-                    current_net.essid = ssid_val
-            elif "DS Parameter set: channel" in line:
-                match_ds = self.RE_DS_CHANNEL.match(line)
-                if match_ds:
-                    current_net.channel = int(match_ds.group(1))
-            elif "primary channel:" in line:
-                match_primary = self.RE_PRIMARY_CHANNEL.match(line)
-                if match_primary:
-                    current_net.channel = int(match_primary.group(1))
-            elif token == "signal:":
-                try:
-                    dbm = float(tokens[1])
-                    current_net.signal_dbm = dbm
-                except (ValueError, IndexError): pass
-            elif token == "WPA:":
-                current_net.wpa = True
-            elif token == "RSN:":
-                current_net.wpa2 = True
-            elif token == "capability:":
-                if "Privacy" in line:
-                    current_net.wep = True
-            elif "WPS:" in line:
-                current_net.wps = True
-
-            if "CCMP" in line:
-                current_net.ccmp = True
-            if "TKIP" in line:
-                current_net.tkip = True
+            handler = get_handler(token)
+            if handler:
+                handler(current_net, rest)
 
         if current_net:
-            networks.append(current_net)
+            yield current_net.finalize()
+
+    @staticmethod
+    def _on_ssid(net: IwOutput, rest: str):
+        ssid_val = rest.strip()
+        if ssid_val:
+            net.essid = ssid_val
 
-        return networks
+    @staticmethod
+    def _on_ds_parameter(net: IwOutput, rest: str):
+        # DS Parameter set: channel <n>
+        words = rest.split()
+        if words[:3] == ["Parameter", "set:", "channel"] and len(words) > 3 and words[3].isdigit():
+            net.channel = int(words[3])
+
+    @staticmethod
+    def _on_signal(net: IwOutput, rest: str):
+        # signal: -67.00 dBm
+        try:
+            value = rest.split(None, 1)[0]
+            dot = value.find('.')
+            net.signal_dbm = int(value[:dot] if dot >= 0 else value)
+        except (ValueError, IndexError):
+            pass
+
+    @staticmethod
+    def _on_wpa(net: IwOutput, rest: str):
+        net.wpa = True
+
+    @staticmethod
+    def _on_rsn(net: IwOutput, rest: str):
+        net.wpa2 = True
+
+    @staticmethod
+    def _on_capability(net: IwOutput, rest: str):
+        if "Privacy" in rest:
+            net.wep = True
+
+    @staticmethod
+    def _on_wps(net: IwOutput, rest: str):
+        net.wps = True
+
+    @staticmethod
+    def _on_sub_field(net: IwOutput, rest: str):
+        """
+        Handles the indented "* key: value" lines of HT operation and RSN/WPA
+        elements, which is the only place iw prints the cipher suites.
+        """
+        # * primary channel: <n>
+        if rest.startswith("primary channel:"):
+            channel = rest[16:].strip()
+            if channel.isdigit():
+                net.channel = int(channel)
+        # * Group cipher: CCMP / * Pairwise ciphers: CCMP TKIP
+        elif rest[:1] in ("G", "P") and "cipher" in rest:
+            if "CCMP" in rest:
+                net.ccmp = True
+            if "TKIP" in rest:
+                net.tkip = True
 
     def get_results(self, reverse_scan: bool = False) -> Dict[int, IwOutput]:
         """
         Returns a sorted dictionary of networks and prints a table to stdout.
         """
-        networks_list = sorted(
-            self.networks.values(),
-            key=lambda x: x.signal_dbm,
-            reverse=True
-        )
-        indexed_results = {(i + 1): net for i, net in enumerate(networks_list)}
-
-        print(f'\nNetworks found: {len(indexed_results)}')
-        # Header
-        print('{:<4} {:<18} {:<22} {:<4} {:<7} {:<6} {:<10} {:<10}'.format(
-            '#', 'BSSID', 'ESSID', 'CH', 'PWR', 'Enc', 'Cipher', 'WPS'))
-
-        items = list(indexed_results.items())
-        if reverse_scan:
-            items = items[::-1]
+        networks_list = sorted(self.networks.values(), key=attrgetter('signal_dbm'), reverse=True)
+        indexed_results = dict(enumerate(networks_list, 1))
+
+        out = [
+            f'\nNetworks found: {len(indexed_results)}\n',
+            # Header
+            '{:<4} {:<18} {:<22} {:<4} {:<7} {:<6} {:<10} {:<10}\n'.format(
+                '#', 'BSSID', 'ESSID', 'CH', 'PWR', 'Enc', 'Cipher', 'WPS'),
+        ]
 
-        for n, net in items:
-            self._print_network_row(n, net)
+        # Numbering always follows signal strength; reversing only flips the display order.
+        items = reversed(indexed_results.items()) if reverse_scan else indexed_results.items()
+        out.extend(self._format_network_row(n, net) for n, net in items)
+        # The whole table goes out in a single write
+        sys.stdout.write("".join(out))
 
         return indexed_results
 
     @staticmethod
-    def _print_network_row(index: int, net: IwOutput):
-        """Helper to print a single row cleanly"""
-        def truncate(s, length):
-            s = str(s)
-            return s[:length-1] + " " if len(s) > length else s.ljust(length)
-
-        def colorize(text, color_code):
-            return f"\033[{color_code}m{text}\033[0m"
-
-        if net.wpa2: enc_str = "WPA2"
-        elif net.wpa: enc_str = "WPA"
-        elif net.wep: enc_str = "WEP"
-        else: enc_str = "Open"
-
-        ciphers = []
-        if net.ccmp: ciphers.append("CCMP")
-        if net.tkip: ciphers.append("TKIP")
-        cipher_str = "+".join(ciphers)
-
-        row = [
-            truncate(f"{index})", 4),
-            truncate(net.bssid, 18),
-            truncate(net.essid, 22),
-            truncate(net.channel, 4),
-            truncate(int(net.signal_dbm), 7),
-            truncate(enc_str, 6),
-            truncate(cipher_str, 10),
-            truncate(net.wps, 10)
-        ]
-
-        line = " ".join(row)
-        if enc_str == "Open":
-            print(colorize(line, "92"))
-        else:
-            print(line)
+    def _format_network_row(index: int, net: IwOutput) -> str:
+        """Helper to format a single table row, including its newline"""
+        line = ROW_FMT.format(f"{index})", net.bssid, net.essid, net.channel, net.signal_dbm,
+                              net.enc_str, net.cipher_str, net.wps)
+        if net.enc_str == "Open":
+            line = f"\033[92m{line}\033[0m"
+        return line + "\n"
@@ -1,23 +1,45 @@
 import sys
 import argparse
 
-from commands import COMMAND_REGISTRY
+from commands import COMMAND_REGISTRY, load_command
+
+
+def _sniff_subcommand(argv):
+    """
+    Returns the subcommand named on the command line, or None when it cannot
+    be determined before parsing (no command, unknown command, or top-level --help).
+    """
+    for token in argv:
+        if token.startswith('-'):
+            if token in ('-h', '--help'):
+                return None
+            continue
+        return token if token in COMMAND_REGISTRY else None
+    return None
 
 
 class CLIDriver:
-    def __init__(self):
+    def __init__(self, argv=None):
+        # None means sys.argv[1:], as with ArgumentParser.parse_args
+        self.argv = argv
         self.parser = argparse.ArgumentParser(description="WiFi data collection and analysis toolkit")
         self.subparsers = self.parser.add_subparsers(dest='command_name', required=True, title='Available Commands')
 
-        for name, cmd_class in COMMAND_REGISTRY.items():
+        # Only the requested command is imported and configured; the full set
+        # is needed for the top-level help and for invalid input.
+        sniffed = _sniff_subcommand(sys.argv[1:] if argv is None else argv)
+        names = [sniffed] if sniffed else COMMAND_REGISTRY
+
+        for name in names:
+            cmd_class = load_command(name)
             cmd_parser = self.subparsers.add_parser(name, help=cmd_class.HELP)
             cmd_class.configure_parser(cmd_parser)
 
     def run(self):
         try:
-            args = self.parser.parse_args()
+            args = self.parser.parse_args(self.argv)
             command_args = vars(args)
-            command_class = COMMAND_REGISTRY[command_args.pop('command_name')]
+            command_class = load_command(command_args.pop('command_name'))
             print(command_class().execute(**command_args))
         except SystemExit:
             pass
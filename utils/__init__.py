@@ -1 +1,2 @@
 from .interface_checker import check_interface_exists, list_interfaces
+from .process import run_tool, tool_path
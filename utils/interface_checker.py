@@ -1,9 +1,14 @@
+import functools
 import os
-import subprocess
 import sys
 
 
+@functools.lru_cache(maxsize=16)
 def check_interface_exists(interface: str) -> None:
+    """
+    Exits with an error if `interface` does not exist. Only successful checks
+    are cached; a missing interface raises SystemExit, which lru_cache never stores.
+    """
     if not interface:
         print(f"[ERROR] Interface required. Available: {', '.join(list_interfaces())}")
         sys.exit(1)
@@ -14,11 +19,13 @@ def check_interface_exists(interface: str) -> None:
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=1)
 def list_interfaces():
-    result = subprocess.run(['ip', 'link', 'show'], capture_output=True, text=True)
-    interfaces = []
-    for line in result.stdout.splitlines():
-        if ': ' in line:
-            iface = line.split(': ')[1].split('@')[0]
-            interfaces.append(iface)
-    return interfaces
+    """
+    Lists network interfaces (except loopback) straight from sysfs instead of
+    parsing `ip link show`.
+    """
+    try:
+        return sorted(name for name in os.listdir("/sys/class/net") if name != "lo")
+    except OSError:
+        return []
@@ -0,0 +1,28 @@
+import functools
+import shutil
+import subprocess
+
+
+@functools.lru_cache(maxsize=None)
+def tool_path(name: str) -> str:
+    """
+    Resolves an external tool on PATH once per process. Falls back to the bare
+    name, so a missing tool still fails the usual way when it is executed.
+    Only meant for tools run with the caller's own privileges; a program run
+    through sudo must be left for sudo to resolve.
+    """
+    return shutil.which(name) or name
+
+
+def run_tool(tool: str, *args: str, **kwargs) -> subprocess.CompletedProcess:
+    """
+    Runs an external tool via subprocess.run. Output is discarded unless
+    `stdout`/`stderr` are passed explicitly.
+
+    :param tool: Name of the executable (e.g. 'ip', 'iw', 'systemctl').
+    :param args: Command line arguments.
+    :param kwargs: Passed through to subprocess.run.
+    """
+    kwargs.setdefault('stdout', subprocess.DEVNULL)
+    kwargs.setdefault('stderr', subprocess.DEVNULL)
+    return subprocess.run([tool_path(tool), *args], **kwargs)